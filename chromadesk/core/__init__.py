@@ -0,0 +1,16 @@
+"""
+Core (non-GUI) functionality for ChromaDesk.
+
+Submodules are imported lazily on first attribute access (PEP 562), so
+``from chromadesk import core`` stays cheap until a module is actually used.
+"""
+import importlib
+
+_SUBMODULES = ("bing", "config", "downloader", "history", "wallpaper")
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        # import_module binds the submodule on the package, so this runs once
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,6 +1,8 @@
 # chromadesk/chromadesk/core/config.py
 import configparser
 import logging
+import os
+import threading
 from pathlib import Path
 from typing import Any
 
@@ -14,6 +16,11 @@ APP_NAME = "ChromaDesk"  # Used for config dir name
 CONFIG_DIR = Path.home() / ".config" / APP_NAME.lower()
 CONFIG_FILE = CONFIG_DIR / "config.ini"
 
+# Parsed config cache used by load_config(), keyed on (path, mtime_ns, size).
+# Re-entrant lock because load_config() may call save_config() itself.
+_config_cache = {"key": None, "config": None}
+_config_cache_lock = threading.RLock()
+
 # Default settings
 DEFAULT_SETTINGS = {
     "Settings": {
@@ -41,29 +48,88 @@ def ensure_config_dir_exists():
         return False
 
 
+def prepare_config(create_default=True) -> bool:
+    """Ensures the config directory exists and, optionally, the default file.
+
+    Does a single mkdir and a single existence check. The default file is
+    written to a temporary file in the same directory and moved into place,
+    so a concurrent reader never sees a half-written config.
+    """
+    try:
+        CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+    except OSError as e:
+        logging.error(f"Error creating config directory {CONFIG_DIR}: {e}")
+        return False
+
+    if not create_default or CONFIG_FILE.is_file():
+        return True
+
+    import tempfile  # Only needed for the first-run default write
+
+    logging.info(f"Config file not found. Creating default config at {CONFIG_FILE}")
+    tmp_path = None
+    try:
+        config = configparser.ConfigParser()
+        config.read_dict(DEFAULT_SETTINGS)
+        with tempfile.NamedTemporaryFile(
+            "w", dir=CONFIG_DIR, prefix=".config-", suffix=".tmp", delete=False
+        ) as tmp_file:
+            tmp_path = tmp_file.name
+            config.write(tmp_file)
+        # NamedTemporaryFile creates 0600 files; match what open() would give
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp_path, 0o666 & ~umask)
+        os.replace(tmp_path, CONFIG_FILE)
+        return True
+    except (OSError, configparser.Error) as e:
+        logging.error(f"Error writing initial default config file {CONFIG_FILE}: {e}")
+        if tmp_path is not None:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+        return False
+
+
 def create_default_config_if_missing():
     """Creates the default config file ONLY if it doesn't exist."""
-    if not ensure_config_dir_exists():
-        return False  # Cannot create file if directory fails
+    return prepare_config(create_default=True)
 
-    if not CONFIG_FILE.is_file():
-        logging.info(f"Config file not found. Creating default config at {CONFIG_FILE}")
-        try:
-            config = configparser.ConfigParser()
-            config.read_dict(DEFAULT_SETTINGS)
-            with open(CONFIG_FILE, "w") as configfile:
-                config.write(configfile)
-            return True
-        except (OSError, configparser.Error) as e:
-            logging.error(
-                f"Error writing initial default config file {CONFIG_FILE}: {e}"
-            )
-            return False
-    return True  # File already exists
+
+def _config_file_key():
+    """Returns the cache key for the config file, or None if it can't be stat'ed."""
+    try:
+        st = os.stat(CONFIG_FILE)
+    except OSError:
+        return None
+    return (os.fspath(CONFIG_FILE), st.st_mtime_ns, st.st_size)
 
 
 def load_config():
-    """Loads the configuration, creates defaults if missing, and ensures all keys exist."""
+    """Loads the configuration, creates defaults if missing, and ensures all keys exist.
+
+    The parsed object is cached and returned again as long as the file's mtime
+    and size are unchanged, so callers must not modify it without saving it
+    via save_config() (which drops the cache).
+    """
+    with _config_cache_lock:
+        key = _config_file_key()
+        if key is not None and key == _config_cache["key"]:
+            return _config_cache["config"]
+
+        config = _read_config()
+
+        # Re-stat: _read_config() may have created or rewritten the file
+        key = _config_file_key()
+        if key is not None:
+            _config_cache["key"] = key
+            _config_cache["config"] = config
+        return config
+
+
+def _read_config():
+    """Parses the config file from disk (uncached part of load_config)."""
     config = configparser.ConfigParser()
 
     # First, ensure the default file exists if it's completely missing
@@ -113,20 +179,36 @@ def load_config():
     return config
 
 
+def _invalidate_cached_settings():
+    """Clears the parsed config cache used by load_config()."""
+    with _config_cache_lock:
+        _config_cache["key"] = None
+        _config_cache["config"] = None
+
+
 def save_config(config):
     """Saves the configuration object to the INI file."""
-    if not ensure_config_dir_exists():
-        logging.error("Cannot save config, directory creation/access failed.")
-        return False
     try:
-        with open(CONFIG_FILE, "w") as configfile:
+        try:
+            configfile = open(CONFIG_FILE, "w")
+        except FileNotFoundError:
+            # Only create the directory when it's actually missing
+            if not ensure_config_dir_exists():
+                logging.error("Cannot save config, directory creation/access failed.")
+                _invalidate_cached_settings()
+                return False
+            configfile = open(CONFIG_FILE, "w")
+        with configfile:
             config.write(configfile)
+        _invalidate_cached_settings()
         # Only log info on explicit saves requested by user actions later,
         # or reduce noise for automatic key additions.
         # logging.info(f"Configuration saved to {CONFIG_FILE}")
         return True
     except (OSError, configparser.Error) as e:
         logging.error(f"Error writing config file {CONFIG_FILE}: {e}")
+        # The caller may have modified the cached object; force a re-read
+        _invalidate_cached_settings()
         return False
 
 
@@ -150,6 +232,25 @@ def set_setting(section, key, value):
         logging.error(f"Failed to save setting [{section}] {key} = {value}.")
 
 
+def set_settings_bulk(updates) -> bool:
+    """Applies several settings at once and saves the file a single time.
+
+    Args:
+        updates (dict): Mapping of section -> {key: value}.
+    """
+    config = load_config()
+    for section, values in updates.items():
+        if not config.has_section(section):
+            config.add_section(section)
+        for key, value in values.items():
+            config.set(section, key, str(value))  # Ensure value is string
+    if save_config(config):
+        logging.info(f"Settings saved: {updates}")
+        return True
+    logging.error(f"Failed to save settings: {updates}")
+    return False
+
+
 def delete_config_file() -> bool:
     """Deletes the application's configuration file."""
     if not CONFIG_FILE.is_file():
@@ -160,6 +261,7 @@ def delete_config_file() -> bool:
 
     try:
         CONFIG_FILE.unlink()
+        _invalidate_cached_settings()
         logging.info(f"Successfully deleted config file: {CONFIG_FILE}")
         # Optionally, try removing the directory if it's empty, but be cautious
         # try:
@@ -1,4 +1,5 @@
 # chromadesk/chromadesk/core/history.py
+import functools
 import logging
 import re  # Import regular expressions
 import shutil
@@ -38,6 +39,7 @@ def ensure_wallpaper_dir() -> bool:
 
 
 # --- Filename Generation ---
+@functools.lru_cache(maxsize=32)
 def get_bing_filename(date_str: str, image_url: str) -> str:
     """Generates a filename for a Bing wallpaper (e.g., bing_20231027.jpg)."""
     try:
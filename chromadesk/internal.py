@@ -0,0 +1,48 @@
+"""
+Installer-only config command for ChromaDesk.
+
+Sets a single config value, e.g.::
+
+    chromadesk --internal-set-config State installed_appimage_path /path/to/app
+
+main.py hands this flag straight to main() below (after configuring logging),
+so it stays out of the user-facing argument parser.
+"""
+
+import logging
+import sys
+
+logger = logging.getLogger(__name__)
+
+
+def main(argv):
+    """Set config [SECTION] KEY = VALUE, creating the config file if needed.
+
+    Args:
+        argv: The arguments following --internal-set-config.
+    """
+    if len(argv) != 3:
+        print(
+            "usage: chromadesk --internal-set-config SECTION KEY VALUE",
+            file=sys.stderr,
+        )
+        return 2
+
+    from chromadesk.core import config as core_config
+
+    section, key, value = argv
+    try:
+        logger.info(f"Internal command: Setting config [{section}].{key} = '{value}'")
+        # load_config() (via set_settings_bulk) creates the config dir and
+        # default file if this is the first run after install
+        success = core_config.set_settings_bulk({section: {key: value}})
+        if success:
+            logger.info("Internal command: Config updated successfully.")
+            return 0  # Exit successfully
+        else:
+            logger.error("Internal command: Failed to update config.")
+            return 1  # Exit with error
+    except Exception as e:
+        logger.critical(f"Internal command: Error setting config: {e}", exc_info=True)
+        return 1  # Exit with error
+
@@ -1,37 +1,76 @@
-import argparse
 import logging
 import os
 import sys
-from importlib.metadata import \
-    version as get_version  # Import earlier for version/internal commands
-from pathlib import Path
+from types import SimpleNamespace
 
-# Import core config early for internal command use
-from chromadesk.core import config as core_config
-
-# Configure logging
 log_format = "%(asctime)s - %(levelname)s - %(message)s"
-log_file_path = Path.home() / ".config" / "chromadesk" / "chromadesk.log"
-try:
-    log_file_path.parent.mkdir(parents=True, exist_ok=True)
-    logging.basicConfig(
-        level=logging.INFO,
-        format=log_format,
-        handlers=[logging.FileHandler(log_file_path), logging.StreamHandler()],
-    )
-except Exception as e:
-    # Fallback basic logging if file handler fails
-    logging.basicConfig(level=logging.WARNING, format=log_format)
-    logging.critical(f"Failed to configure file logging: {e}")
+
+# Upper bound (seconds) headless mode waits for a background notification
+NOTIFICATION_TIMEOUT = 5
+
+
+def _configure_logging():
+    """Configure file + console logging for the modes that actually do work.
+
+    The level defaults to INFO and can be overridden with CHROMADESK_LOG_LEVEL
+    (e.g. WARNING or DEBUG). This replaces any handlers installed earlier
+    (force=True), so the variable is honored by every entry point: the
+    chromadesk/chromadesk-gui scripts and ``python -m chromadesk``.
+    """
+    level_name = os.environ.get("CHROMADESK_LOG_LEVEL", "INFO").upper()
+    level = logging.getLevelName(level_name)
+    if not isinstance(level, int):  # Unknown names come back as "Level <name>"
+        level = logging.INFO
+    try:
+        # Resolved here rather than at import so --version never looks up $HOME
+        log_dir = os.path.join(os.path.expanduser("~"), ".config", "chromadesk")
+        os.makedirs(log_dir, exist_ok=True)
+        log_file_path = os.path.join(log_dir, "chromadesk.log")
+        logging.basicConfig(
+            level=level,
+            format=log_format,
+            # __main__.py and core.config may already have called basicConfig
+            force=True,
+            handlers=[
+                # delay=True: don't open the file until the first record
+                logging.FileHandler(log_file_path, delay=True),
+                logging.StreamHandler(),
+            ],
+        )
+    except Exception as e:
+        # Fallback basic logging if file handler fails
+        logging.basicConfig(level=logging.WARNING, format=log_format, force=True)
+        logging.critical(f"Failed to configure file logging: {e}")
+
 
 logger = logging.getLogger(__name__)
 
-# Suppress Mesa Intel warning
-os.environ["MESA_DEBUG"] = "silent"
+
+def _parse_args_fast(argv):
+    """Hand-dispatch the common invocations without importing argparse.
+
+    Returns None for anything unusual (--help, unknown or combined flags) so
+    the caller can fall back to the full argparse parser. A lone --version
+    never gets here: main() answers it before parsing.
+    """
+    args = SimpleNamespace(gui=False, headless=False, version=False)
+    if not argv or argv == ["--gui"]:
+        args.gui = True
+    elif argv == ["--headless"]:
+        args.headless = True
+    else:
+        return None
+    return args
 
 
 def parse_args():
     """Parse command line arguments."""
+    args = _parse_args_fast(sys.argv[1:])
+    if args is not None:
+        return args
+
+    import argparse
+
     parser = argparse.ArgumentParser(description="ChromaDesk - Daily Wallpaper Changer")
 
     # GUI mode (default)
@@ -51,94 +90,125 @@ def parse_args():
         "--version", action="store_true", help="Show version information"
     )
 
-    # Internal command for installer (hidden from help)
-    parser.add_argument(
-        "--internal-set-config",
-        nargs=3,
-        metavar=("SECTION", "KEY", "VALUE"),
-        help=argparse.SUPPRESS,
-    )
-
     args = parser.parse_args()
 
     # If no specific mode is requested, default to GUI
-    # (Ensure internal command doesn't trigger default GUI)
-    if not args.headless and not args.version and not args.internal_set_config:
+    if not args.headless and not args.version:
         args.gui = True
 
     return args
 
 
+def _send_notification_quietly(send_notification, title, message):
+    """Thread target: send a desktop notification, logging any failure."""
+    try:
+        send_notification(title, message)
+    except Exception as notify_err:
+        logger.warning(f"Headless: Failed to send notification: {notify_err}")
+
+
+def _print_version():
+    """Print the installed package version and return the exit code."""
+    # importlib.metadata is comparatively heavy; only the version path needs it
+    from importlib.metadata import version
+
+    try:
+        print(f"ChromaDesk version {version('chromadesk')}")
+    except Exception:  # More general exception if metadata fails
+        print("ChromaDesk (version unknown)")
+    return 0
+
+
 def main():
     """Main entry point for ChromaDesk."""
-    args = parse_args()
+    # Fast path: answer --version before building the parser or touching logs
+    if sys.argv[1:] == ["--version"]:
+        return _print_version()
 
-    # Handle internal config setting command first
-    if args.internal_set_config:
-        section, key, value = args.internal_set_config
-        try:
-            logger.info(
-                f"Internal command: Setting config [{section}].{key} = '{value}'"
-            )
-            # Ensure config dir exists first
-            if not core_config.ensure_config_dir_exists():
-                raise RuntimeError("Failed to ensure config directory exists.")
-            # Create default if it doesn't exist (might be first run after install)
-            if not core_config.create_default_config_if_missing():
-                raise RuntimeError("Failed to create default config file.")
-
-            success = core_config.set_setting(section, key, value)
-            if success:
-                logger.info("Internal command: Config updated successfully.")
-                return 0  # Exit successfully
-            else:
-                logger.error(
-                    "Internal command: Failed to update config using set_setting."
-                )
-                return 1  # Exit with error
-        except Exception as e:
-            logger.critical(
-                f"Internal command: Error setting config: {e}", exc_info=True
-            )
-            return 1  # Exit with error
+    # Installer-only command (installer.sh calls it through the AppImage);
+    # kept out of the parser, see chromadesk.internal
+    if sys.argv[1:2] == ["--internal-set-config"]:
+        _configure_logging()
+        from chromadesk.internal import main as internal_main
 
-    # Show version info if requested
+        return internal_main(sys.argv[2:])
+
+    args = parse_args()
+
+    # Show version info if requested (needs no log file)
     if args.version:
-        try:
-            ver = get_version("chromadesk")
-            print(f"ChromaDesk version {ver}")
-        except Exception:  # More general exception if metadata fails
-            print("ChromaDesk (version unknown)")
-        return 0
+        return _print_version()
+
+    # --help exits inside parse_args(), so only real work gets here
+    _configure_logging()
 
     # Handle headless update mode
     if args.headless:
         logger.info("Running in --headless update mode")
         # Import necessary core functions for headless operation
         try:
-            # config already imported
+            import threading
             from datetime import date
 
-            from chromadesk.core import bing as core_bing
-            from chromadesk.core import downloader as core_downloader
-            from chromadesk.core import history as core_history
-            from chromadesk.core import wallpaper as core_wallpaper
+            from chromadesk import core
+
+            core_config = core.config
+            core_bing = core.bing
+            core_downloader = core.downloader
+            core_history = core.history
+            core_wallpaper = core.wallpaper
         except ImportError as e:
             logger.critical(f"Failed to import core components for headless mode: {e}")
             return 1
 
         # --- Perform the headless update logic ---
         success = False
+        notify_thread = None
         try:
             logger.info("Headless: Starting daily update check.")
 
             # 1. Check config if enabled (although timer shouldn't run if not)
             config = core_config.load_config()
-            if config.getboolean("Settings", "enabled", fallback=False):
-                logger.info("Headless: Daily updates are enabled in config.")
+            # Snapshot the sections into plain dicts instead of repeated config.get*()
+            settings = (
+                dict(config["Settings"]) if config.has_section("Settings") else {}
+            )
+            state = dict(config["State"]) if config.has_section("State") else {}
+            enabled_str = settings.get("enabled", "false")
+            enabled = config.BOOLEAN_STATES.get(enabled_str.lower())
+            if enabled is None:
+                logger.warning(
+                    f"Headless: Unrecognized 'enabled' value {enabled_str!r}; treating as disabled."
+                )
+                enabled = False
+            region = settings.get("region", "en-US")
+            try:
+                keep_count = int(settings.get("keep_history", 7))
+            except ValueError:
+                logger.warning(
+                    f"Headless: Invalid 'keep_history' value {settings['keep_history']!r}; using 7."
+                )
+                keep_count = 7
+            last_update_date = state.get("last_update_date", "")
+
+            today_str = date.today().isoformat()
 
-                # 2. Get region
-                region = config.get("Settings", "region", fallback="en-US")
+            if not enabled:
+                logger.info("Headless: Daily updates are disabled in config. Skipping.")
+                success = True  # Not an error if disabled
+
+            # 2. Check if already updated today (before any network access)
+            elif last_update_date == today_str:
+                logger.info(
+                    f"Headless: Wallpaper already updated today ({today_str}). Skipping."
+                )
+                success = True  # Consider it success if already done
+
+            else:
+                logger.info("Headless: Daily updates are enabled in config.")
+                logger.info(
+                    f"Headless: Last update was {last_update_date}, proceeding with update for {today_str}."
+                )
 
                 # 3. Fetch Bing info
                 logger.info(f"Headless: Fetching Bing info for region: {region}")
@@ -149,86 +219,69 @@ def main():
                         f"Headless: Successfully fetched Bing info for date {bing_info.get('date')}"
                     )
 
-                    # 4. Check if already updated today
-                    today_str = date.today().isoformat()
-                    last_update_date = config.get(
-                        "State", "last_update_date", fallback=""
+                    # 4. Download image
+                    if not core_history.ensure_wallpaper_dir():
+                        raise RuntimeError(
+                            "Headless: Cannot create wallpaper directory."
+                        )
+
+                    wallpaper_dir = core_history.get_wallpaper_dir()
+                    filename = core_history.get_bing_filename(
+                        bing_info["date"], bing_info["full_url"]
                     )
-                    if last_update_date == today_str:
+                    save_path = wallpaper_dir / filename
+
+                    if os.path.isfile(os.fspath(save_path)):
                         logger.info(
-                            f"Headless: Wallpaper already updated today ({today_str}). Skipping."
+                            f"Headless: Image {filename} already exists. Using existing file."
                         )
-                        success = True  # Consider it success if already done
+                        download_ok = True
                     else:
-                        logger.info(
-                            f"Headless: Last update was {last_update_date}, proceeding with update for {today_str}."
+                        logger.info(f"Headless: Downloading image to {save_path}...")
+                        download_ok = core_downloader.download_image(
+                            bing_info["full_url"], save_path
                         )
-                        # 5. Download image
-                        if not core_history.ensure_wallpaper_dir():
-                            raise RuntimeError(
-                                "Headless: Cannot create wallpaper directory."
-                            )
 
-                        wallpaper_dir = core_history.get_wallpaper_dir()
-                        filename = core_history.get_bing_filename(
-                            bing_info["date"], bing_info["full_url"]
-                        )
-                        save_path = wallpaper_dir / filename
-
-                        if save_path.is_file():
-                            logger.info(
-                                f"Headless: Image {filename} already exists. Using existing file."
-                            )
-                            download_ok = True
-                        else:
-                            logger.info(
-                                f"Headless: Downloading image to {save_path}..."
-                            )
-                            download_ok = core_downloader.download_image(
-                                bing_info["full_url"], save_path
+                    if download_ok:
+                        logger.info("Headless: Download successful (or file existed).")
+                        # 5. Set Wallpaper
+                        logger.info(f"Headless: Setting wallpaper to {save_path}")
+                        set_ok = core_wallpaper.set_gnome_wallpaper(save_path)
+
+                        if set_ok:
+                            logger.info("Headless: Wallpaper set successfully.")
+                            # 6. Send notification in the background so the
+                            # DBus round-trip overlaps with the work below
+                            title = bing_info.get("title", "Unknown Title")
+                            notify_thread = threading.Thread(
+                                target=_send_notification_quietly,
+                                args=(
+                                    core_wallpaper.send_notification,
+                                    "ChromaDesk Update",
+                                    f"Wallpaper updated successfully to: {title}",
+                                ),
+                                daemon=True,
                             )
+                            notify_thread.start()
 
-                        if download_ok:
-                            logger.info(
-                                "Headless: Download successful (or file existed)."
+                            # 7. Update state and cleanup history
+                            state_saved = core_config.set_settings_bulk(
+                                {"State": {"last_update_date": today_str}}
                             )
-                            # 6. Set Wallpaper
-                            logger.info(f"Headless: Setting wallpaper to {save_path}")
-                            set_ok = core_wallpaper.set_gnome_wallpaper(save_path)
-
-                            if set_ok:
-                                logger.info("Headless: Wallpaper set successfully.")
-                                # 7. Update state and cleanup history
-                                core_config.set_setting(
-                                    "State", "last_update_date", today_str
-                                )
-                                keep_count = config.getint(
-                                    "Settings", "keep_history", fallback=7
-                                )
-                                core_history.cleanup_wallpaper_history(keep=keep_count)
-
-                                # 8. Send notification
-                                try:
-                                    title = bing_info.get("title", "Unknown Title")
-                                    core_wallpaper.send_notification(
-                                        "ChromaDesk Update",
-                                        f"Wallpaper updated successfully to: {title}",
-                                    )
-                                except Exception as notify_err:
-                                    logger.warning(
-                                        f"Headless: Failed to send notification: {notify_err}"
-                                    )
+                            core_history.cleanup_wallpaper_history(keep=keep_count)
 
+                            if state_saved:
                                 success = True
                             else:
-                                logger.error("Headless: Failed to set wallpaper.")
+                                logger.error(
+                                    "Headless: Wallpaper set, but failed to save last_update_date."
+                                )
                         else:
-                            logger.error("Headless: Failed to download image.")
+                            logger.error("Headless: Failed to set wallpaper.")
+                    else:
+                        logger.error("Headless: Failed to download image.")
                 else:
                     logger.error("Headless: Failed to fetch Bing wallpaper info.")
-            else:
-                logger.info("Headless: Daily updates are disabled in config. Skipping.")
-                success = True  # Not an error if disabled
 
         except Exception as e:
             logger.critical(
@@ -238,6 +291,11 @@ def main():
             success = False
         # --- End headless update logic ---
 
+        # Give the notification a bounded chance to go out; a daemon thread
+        # would otherwise be killed at interpreter exit before DBus replies
+        if notify_thread is not None:
+            notify_thread.join(timeout=NOTIFICATION_TIMEOUT)
+
         logger.info(f"Headless update finished. Success: {success}")
         return 0 if success else 1
 
@@ -248,9 +306,13 @@ def main():
             from PySide6.QtWidgets import QApplication
             from chromadesk.ui.main_window import MainWindow
         except ImportError as e:
-            logger.critical(f"Failed to import GUI components: {e}")
+            # The message says it all; skip exc_info and the traceback formatting
+            logger.error("Failed to import GUI components: %s", e)
             return 1
 
+        # Suppress Mesa Intel warning (only relevant once Qt touches OpenGL)
+        os.environ.setdefault("MESA_DEBUG", "silent")
+
         try:
             app = QApplication(sys.argv)
             app.setApplicationName("ChromaDesk")
@@ -261,15 +323,13 @@ def main():
             window.show()
             result = app.exec()
             return result
-        except Exception as e:
-            logger.critical(
-                f"An error occurred during GUI execution: {e}", exc_info=True
-            )
+        except Exception:
+            logger.exception("An error occurred during GUI execution")
             return 1
 
 
 if __name__ == "__main__":
-    logger.debug("Script starting in __main__...")
     result = main()
-    logger.debug(f"main() finished with exit code: {result}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("main() finished with exit code: %s", result)
     sys.exit(result)
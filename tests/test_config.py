@@ -0,0 +1,99 @@
+"""
+Tests for ChromaDesk configuration handling.
+"""
+import configparser
+import os
+import stat
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from chromadesk.core import config as core_config
+
+
+class TestConfig(unittest.TestCase):
+    """Test config file helpers against a temporary config directory."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        config_dir = Path(self._tmp.name) / "chromadesk"
+        patches = [
+            mock.patch.object(core_config, "CONFIG_DIR", config_dir),
+            mock.patch.object(core_config, "CONFIG_FILE", config_dir / "config.ini"),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        core_config._invalidate_cached_settings()
+        self.addCleanup(self._tmp.cleanup)
+
+    def _read_file(self):
+        config = configparser.ConfigParser()
+        config.read(core_config.CONFIG_FILE)
+        return config
+
+    def test_prepare_config_creates_defaults(self):
+        """Test that prepare_config creates the directory and default file."""
+        self.assertTrue(core_config.prepare_config())
+        config = self._read_file()
+        self.assertEqual(config.get("Settings", "enabled"), "false")
+        # No temporary files are left behind
+        self.assertEqual(
+            [p.name for p in core_config.CONFIG_DIR.iterdir()], ["config.ini"]
+        )
+
+    def test_prepare_config_uses_umask_permissions(self):
+        """Test that the default file gets the usual umask-based mode."""
+        umask = os.umask(0o022)
+        self.addCleanup(os.umask, umask)
+        self.assertTrue(core_config.prepare_config())
+        self.assertEqual(stat.S_IMODE(core_config.CONFIG_FILE.stat().st_mode), 0o644)
+
+    def test_prepare_config_keeps_existing_file(self):
+        """Test that an existing config file is not overwritten."""
+        core_config.CONFIG_DIR.mkdir(parents=True)
+        core_config.CONFIG_FILE.write_text("[Settings]\nregion = de-DE\n")
+        self.assertTrue(core_config.prepare_config())
+        self.assertEqual(self._read_file().get("Settings", "region"), "de-DE")
+
+    def test_prepare_config_rejects_directory_at_file_path(self):
+        """Test that a directory named like the config file is not accepted."""
+        core_config.CONFIG_FILE.mkdir(parents=True)
+        self.assertFalse(core_config.prepare_config())
+
+    def test_set_settings_bulk(self):
+        """Test that several settings are written in one call."""
+        ok = core_config.set_settings_bulk(
+            {
+                "State": {"last_update_date": "2024-01-02"},
+                "Settings": {"keep_history": 3},
+            }
+        )
+        self.assertTrue(ok)
+        config = self._read_file()
+        self.assertEqual(config.get("State", "last_update_date"), "2024-01-02")
+        self.assertEqual(config.get("Settings", "keep_history"), "3")
+        # Untouched defaults are preserved
+        self.assertEqual(config.get("Settings", "enabled"), "false")
+
+    def test_load_config_is_cached_until_file_changes(self):
+        """Test that load_config re-parses only when the file changes."""
+        first = core_config.load_config()
+        self.assertIs(core_config.load_config(), first)
+
+        # An external edit (different size) invalidates the cache
+        core_config.CONFIG_FILE.write_text(
+            core_config.CONFIG_FILE.read_text().replace("en-IN", "es-419")
+        )
+        reloaded = core_config.load_config()
+        self.assertIsNot(reloaded, first)
+        self.assertEqual(reloaded.get("Settings", "region"), "es-419")
+
+        # So does an in-process save
+        core_config.set_settings_bulk({"Settings": {"region": "fr-FR"}})
+        self.assertEqual(core_config.load_config().get("Settings", "region"), "fr-FR")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+"""
+Tests for ChromaDesk command line handling and headless updates.
+"""
+import sys
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+from unittest import mock
+
+from chromadesk import core, main
+from chromadesk.core import config as core_config
+
+
+class TestParseArgsFast(unittest.TestCase):
+    """Test the argparse-free fast path for common invocations."""
+
+    def test_no_args_defaults_to_gui(self):
+        """Test that running without arguments selects the GUI."""
+        args = main._parse_args_fast([])
+        self.assertTrue(args.gui)
+        self.assertFalse(args.headless)
+
+    def test_headless(self):
+        """Test that --headless is recognised."""
+        args = main._parse_args_fast(["--headless"])
+        self.assertTrue(args.headless)
+        self.assertFalse(args.gui)
+
+    def test_unusual_args_fall_back(self):
+        """Test that help, unknown and combined flags defer to argparse."""
+        self.assertIsNone(main._parse_args_fast(["--help"]))
+        self.assertIsNone(main._parse_args_fast(["--bogus"]))
+        self.assertIsNone(main._parse_args_fast(["--gui", "--headless"]))
+
+
+class TestHeadless(unittest.TestCase):
+    """Test the --headless update flow against a temporary config."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        config_dir = Path(self._tmp.name) / "chromadesk"
+        self.fake_bing = mock.Mock()
+        self.fake_downloader = mock.Mock()
+        self.fake_wallpaper = mock.Mock()
+        patches = [
+            mock.patch.object(core_config, "CONFIG_DIR", config_dir),
+            mock.patch.object(core_config, "CONFIG_FILE", config_dir / "config.ini"),
+            mock.patch.object(sys, "argv", ["chromadesk", "--headless"]),
+            mock.patch.object(main, "_configure_logging"),
+            # Bound straight into the package dict so core.__getattr__ never
+            # imports the real network/desktop modules
+            mock.patch.dict(
+                vars(core),
+                {
+                    "bing": self.fake_bing,
+                    "downloader": self.fake_downloader,
+                    "wallpaper": self.fake_wallpaper,
+                },
+            ),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        core_config._invalidate_cached_settings()
+
+        self.wallpaper_dir = Path(self._tmp.name) / "wallpapers"
+        core_config.set_settings_bulk(
+            {"Settings": {"enabled": "true", "wallpaper_dir": self.wallpaper_dir}}
+        )
+
+    def test_skips_fetch_when_already_updated_today(self):
+        """Test that no Bing request is made once today's update is done."""
+        core_config.set_settings_bulk(
+            {"State": {"last_update_date": date.today().isoformat()}}
+        )
+        self.assertEqual(main.main(), 0)
+        self.fake_bing.fetch_bing_wallpaper_info.assert_not_called()
+
+    def test_failed_state_save_returns_error(self):
+        """Test that failing to record last_update_date fails the run."""
+        self.fake_bing.fetch_bing_wallpaper_info.return_value = {
+            "date": "20240102",
+            "full_url": "https://www.bing.com/th?id=OHR.Example.jpg",
+            "title": "Example",
+        }
+        self.fake_downloader.download_image.return_value = True
+        self.fake_wallpaper.set_gnome_wallpaper.return_value = True
+
+        with mock.patch.object(
+            core_config, "set_settings_bulk", return_value=False
+        ) as set_settings_bulk:
+            self.assertEqual(main.main(), 1)
+        self.fake_wallpaper.set_gnome_wallpaper.assert_called_once()
+        set_settings_bulk.assert_called_once()
+
+if __name__ == "__main__":
+    unittest.main()